@@ -0,0 +1,126 @@
+"""
+共享的基础假设
+
+各单图脚本、batch_render、watch、export_tables 和 report 都从这里读取数据，
+修改这里的假设后所有图表和导出的数据表保持一致。只包含数据和不依赖
+matplotlib 的简单计算，导出数据表时不需要加载绘图库。
+"""
+
+# ==================== 策略 ====================
+strategies = ['固收配置策略', '固收+', 'SAA策略', '外委多资产策略', '权益-', '权益策略', '权益+']
+existing_strategies = ['固收配置策略', '权益策略', 'SAA策略']  # 存量策略（绿色）
+new_strategies = ['固收+', '外委多资产策略', '权益-', '权益+']  # 新策略（红色）
+
+# ==================== 固收-权益组合（portfolio_theory_visualization.py） ====================
+portfolio_theory = {
+    'stock_return': 7.5,  # 权益预期收益率 (%)
+    'stock_volatility': 18.0,  # 权益波动率 (%)
+    'bond_return': 4.5,  # 固收预期收益率 (%)
+    'bond_volatility': 7.0,  # 固收波动率 (%)
+    'correlation': 0.2,  # 权益和固收的相关系数
+}
+
+# ==================== TAA 层次结构（taa_hierarchy.py） ====================
+taa_top_node = 'TAA'
+# 第一层节点按风险特征分类，x 为图中的水平位置
+taa_first_level_nodes = [
+    {'name': '固收配置策略', 'category': '稳定收益类', 'x': 0.15},
+    {'name': '固收交易策略', 'category': '稳定收益类', 'x': 0.35},
+    {'name': '权益配置', 'category': '波动类', 'x': 0.65},
+    {'name': '境外TAA调整组合', 'category': '波动类', 'x': 0.85},
+]
+# 橙色 = 稳定收益类，蓝色 = 波动类
+taa_category_colors = {'稳定收益类': '#ED7D31', '波动类': '#4472C4'}
+
+# ==================== 默认假设（watch.py 中每个字段是一个输入节点） ====================
+default_assumptions = {
+    'asset_returns': {
+        'fixed_income_return': [3.5, 4.5],  # 固收：3.5%-4.5%
+        'equity_return': [6.0, 8.0],  # 权益：6%-8%
+        'alternative_return': [10.0, 13.0],  # 另类资产：10%-13%（商品、黄金等）
+    },
+    # strategy_visualization.py
+    'strategy_allocation': {
+        'strategies': strategies,
+        'fixed_income_ratio': [100, 95, 92, 85, 30, 0, 0],
+        'equity_ratio': [0, 5, 8, 15, 70, 100, 60],
+        'alternative_ratio': [0, 0, 0, 0, 0, 0, 40],
+        'fixed_return_ranges': {'权益+': [8.0, 10.0]},  # 权益+策略使用固定的8%-10%
+    },
+    # strategy_visualization_v2.py
+    'strategy_allocation_v2': {
+        'strategies': ['固收配置策略', 'SAA策略', '外委多资产策略', '权益策略'],
+        'fixed_income_ratio': [100, 92, 40, 0],
+        'equity_ratio': [0, 8, 60, 100],
+        'alternative_ratio': [0, 0, 0, 0],
+        'fixed_return_ranges': {'外委多资产策略': [5.5, 6.5]},  # 外委多资产策略使用固定的5.5%-6.5%
+    },
+    # efficient_frontier.py
+    'efficient_frontier': {
+        'expected_returns': [4.0, 4.15, 4.25, 4.45, 6.15, 7.0, 9.0],
+        'volatilities': [2.5, 3.5, 4.5, 5.5, 11.0, 16.0, 19.0],
+    },
+    # portfolio_theory_visualization.py
+    'portfolio_theory': portfolio_theory,
+    # taa_hierarchy.py
+    'taa_hierarchy': {
+        'top_node': taa_top_node,
+        'first_level_nodes': taa_first_level_nodes,
+        'category_colors': taa_category_colors,
+    },
+}
+
+# efficient_frontier.py 计算夏普比率使用的无风险利率 (%)
+risk_free_rate = 2.5
+
+
+def check_lengths(client, keys, count):
+    """
+    检查每个策略一个值的字段长度是否等于策略数
+
+    charts.py 的模板图按策略数预先创建柱子和标注，长度不一致时只会更新
+    一部分，其余柱子和标注保留上一次的数据，所以先检查再计算或绘制
+    """
+    for key in keys:
+        if len(client[key]) != count:
+            raise ValueError(f"'{key}' 有 {len(client[key])} 个值，应与策略数 {count} 一致")
+
+
+def calculate_return_bounds(client):
+    """
+    计算每个策略的预期收益率区间
+
+    fixed_return_ranges 中列出的策略使用固定区间（如权益+为8%-10%），
+    其他策略根据配置比例计算
+
+    返回:
+    bounds: [(收益率下限, 收益率上限), ...] (%)
+    """
+    fi, eq, alt = client['fixed_income_ratio'], client['equity_ratio'], client['alternative_ratio']
+    fi_ret, eq_ret, alt_ret = client['fixed_income_return'], client['equity_return'], client['alternative_return']
+    fixed_ranges = client.get('fixed_return_ranges', {})
+    client_strategies = client.get('strategies', strategies)
+    check_lengths(client, ['fixed_income_ratio', 'equity_ratio', 'alternative_ratio'], len(client_strategies))
+    bounds = []
+    for i, strategy in enumerate(client_strategies):
+        if strategy in fixed_ranges:
+            min_return, max_return = fixed_ranges[strategy]
+        else:
+            min_return = (fi[i] / 100) * fi_ret[0] + (eq[i] / 100) * eq_ret[0] + (alt[i] / 100) * alt_ret[0]
+            max_return = (fi[i] / 100) * fi_ret[1] + (eq[i] / 100) * eq_ret[1] + (alt[i] / 100) * alt_ret[1]
+        bounds.append((min_return, max_return))
+    return bounds
+
+
+def format_return_range(min_return, max_return):
+    """
+    图表和报告中显示的收益率区间文字，如 '3.5-4.5%'
+    """
+    return f'{min_return:.1f}-{max_return:.1f}%'
+
+
+def calculate_return_ranges(client):
+    """
+    计算每个策略的预期收益率区间文字
+    """
+    return [format_return_range(*bounds) for bounds in calculate_return_bounds(client)]
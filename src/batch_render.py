@@ -0,0 +1,211 @@
+"""
+批量渲染客户组合图表
+
+每个工作进程只创建一次模板图（charts.py 中的资产配置堆叠柱状图 + 有效前沿
+散点图，与单图脚本共用），之后对每个客户只更新柱高、文字和散点位置再保存，
+避免重复创建 24×16 的画布、字体和所有 ax.text。
+
+客户数据为 JSON Lines 文件，每行一个客户，例如：
+{"client_id": "C0001",
+ "fixed_income_ratio": [100, 95, 92, 85, 30, 0, 0],
+ "equity_ratio": [0, 5, 8, 15, 70, 100, 60],
+ "alternative_ratio": [0, 0, 0, 0, 0, 0, 40],
+ "expected_returns": [4.0, 4.15, 4.25, 4.45, 6.15, 7.0, 9.0],
+ "volatilities": [2.5, 3.5, 4.5, 5.5, 11.0, 16.0, 19.0]}
+缺省字段使用与 strategy_visualization.py / efficient_frontier.py 相同的默认值。
+
+用法：
+python batch_render.py clients.jsonl --output-dir output/clients --workers 8
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import matplotlib
+matplotlib.use('Agg')
+
+from assumptions import check_lengths, default_assumptions, strategies
+from charts import AllocationTemplate, FrontierTemplate, allocation_keys, frontier_keys
+from fonts import setup_chinese_font
+
+# 配置中文字体（工作进程启动时直接加载缓存的字体文件）
+setup_chinese_font()
+
+# ==================== 默认数据（与单图脚本一致） ====================
+default_client = {
+    **default_assumptions['asset_returns'],
+    **default_assumptions['strategy_allocation'],
+    **default_assumptions['efficient_frontier'],
+}
+
+# ==================== 工作进程 ====================
+_templates = None
+
+
+def _init_worker():
+    """
+    工作进程初始化：每个进程只创建一次模板图
+    """
+    global _templates
+    _templates = {
+        'allocation': AllocationTemplate(),
+        'frontier': FrontierTemplate(),
+    }
+
+
+def render_client(client, output_dir, dpi):
+    """
+    渲染单个客户的两张图表
+
+    返回:
+    client_id: 客户编号
+    paths: 保存的图表路径列表
+    """
+    if _templates is None:
+        _init_worker()
+    client = {**default_client, **client}
+    client_id = str(client['client_id'])
+    # 先检查全部字段再渲染，数据有误的客户不会留下部分图表，并按普通异常重试和计失败
+    if list(client['strategies']) != strategies:
+        raise ValueError(f"客户 {client_id} 的策略列表与模板图不一致")
+    check_lengths(client, allocation_keys + frontier_keys, len(strategies))
+    paths = []
+    for name, template in _templates.items():
+        template.update(client)
+        path = os.path.join(output_dir, f'{client_id}_{name}.png')
+        template.save(path, dpi)
+        paths.append(path)
+    return client_id, paths
+
+
+def load_clients(path):
+    """
+    读取 JSON Lines 格式的客户数据
+    """
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _render_pool(queue, clients, output_dir, dpi, workers, attempts, max_retries, failed, on_done):
+    """
+    在一个进程池中渲染 queue 中的客户，同时最多提交 workers 个任务
+
+    普通异常在本进程池中重试；工作进程异常退出时立即返回崩溃时仍在执行的
+    客户编号，queue 中尚未提交的客户不计失败次数
+
+    返回:
+    suspects: 进程池崩溃时仍在执行的客户编号（未崩溃时为空列表）
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        running = {}
+        while queue or running:
+            while queue and len(running) < workers:
+                cid = queue.popleft()
+                try:
+                    future = pool.submit(render_client, clients[cid], output_dir, dpi)
+                except BrokenProcessPool:
+                    # 工作进程在上一次 wait 之后退出：放回未提交的客户，按崩溃处理仍在执行的客户
+                    queue.appendleft(cid)
+                    return list(running.values())
+                running[future] = cid
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            broken = []
+            for future in finished:
+                cid = running.pop(future)
+                try:
+                    future.result()
+                except BrokenProcessPool:
+                    broken.append(cid)
+                except Exception as e:
+                    attempts[cid] += 1
+                    if attempts[cid] > max_retries:
+                        failed[cid] = repr(e)
+                    else:
+                        queue.append(cid)
+                else:
+                    on_done(cid)
+            if broken:
+                return broken + list(running.values())
+    return []
+
+
+def render_all(clients, output_dir, workers=None, dpi=300, max_retries=2):
+    """
+    用进程池批量渲染所有客户
+
+    工作进程异常退出时，只有崩溃时正在执行的客户会被逐个放到单进程池中重试，
+    从而只把真正导致崩溃的客户计为失败，其余客户在重建的进程池中继续渲染
+
+    参数:
+    clients: 客户数据列表（client_id 不能重复）
+    output_dir: 输出目录
+    workers: 进程数（默认为 CPU 核数）
+    dpi: 保存分辨率
+    max_retries: 每个客户最多重试次数
+
+    返回:
+    failed: 重试后仍失败的 {client_id: 错误信息}
+    """
+    ids = [str(c['client_id']) for c in clients]
+    duplicates = sorted(cid for cid, count in Counter(ids).items() if count > 1)
+    if duplicates:
+        raise ValueError(f"客户编号重复：{', '.join(duplicates)}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    clients = dict(zip(ids, clients))
+    attempts = dict.fromkeys(ids, 0)
+    failed = {}
+    total = len(ids)
+    done = 0
+    start = time.perf_counter()
+
+    def on_done(cid):
+        nonlocal done
+        done += 1
+        if done % 50 == 0:
+            elapsed = time.perf_counter() - start
+            print(f"[{done}/{total}] 已完成，{done / elapsed:.1f} 客户/秒")
+
+    queue = deque(ids)
+    while queue:
+        suspects = _render_pool(queue, clients, output_dir, dpi, workers,
+                                attempts, max_retries, failed, on_done)
+        if suspects:
+            print(f"工作进程异常退出，逐个重试 {len(suspects)} 个客户，剩余 {len(queue)} 个客户")
+        # 逐个在单进程池中重试，只有导致崩溃的客户计失败次数
+        for cid in suspects:
+            retry = deque([cid])
+            while retry:
+                if _render_pool(retry, clients, output_dir, dpi, 1,
+                                attempts, max_retries, failed, on_done):
+                    attempts[cid] += 1
+                    if attempts[cid] > max_retries:
+                        failed[cid] = '工作进程异常退出'
+                    else:
+                        retry.append(cid)
+
+    elapsed = time.perf_counter() - start
+    print(f"[{done}/{total}] 已完成，耗时 {elapsed:.1f} 秒")
+    if failed:
+        print(f"渲染失败 {len(failed)} 个客户：{', '.join(sorted(failed))}")
+    return failed
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='批量渲染客户组合图表')
+    parser.add_argument('clients', help='客户数据文件（JSON Lines）')
+    parser.add_argument('--output-dir', default=os.path.join('output', 'clients'))
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--dpi', type=int, default=300)
+    parser.add_argument('--max-retries', type=int, default=2)
+    args = parser.parse_args()
+
+    failed = render_all(load_clients(args.clients), args.output_dir,
+                        workers=args.workers, dpi=args.dpi, max_retries=args.max_retries)
+    sys.exit(1 if failed else 0)
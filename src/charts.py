@@ -0,0 +1,418 @@
+"""
+单图脚本、批量渲染、监视模式与 PDF 报告共用的图表绘制代码
+
+- AllocationTemplate：资产配置堆叠柱状图（strategy_visualization*.py）
+- FrontierTemplate：有效前沿散点图（efficient_frontier.py）
+- draw_portfolio_theory：固收-权益组合的有效前沿（portfolio_theory_visualization.py）
+- draw_taa_hierarchy：TAA 层次结构图（taa_hierarchy.py）
+
+各单图脚本、batch_render、watch 和 report 都调用这里的代码，保证脚本输出的
+PNG 与报告中的页面一致。字体和绘图后端由调用方配置。
+"""
+import matplotlib.patches as mpatches
+import matplotlib.pyplot as plt
+import numpy as np
+
+from assumptions import (calculate_return_ranges, check_lengths, default_assumptions,
+                         existing_strategies, new_strategies, strategies)
+from correlation import portfolio_volatility, prepare_correlation
+
+
+# ==================== 固收-权益组合与 TAA 层次结构 ====================
+def draw_portfolio_theory(stock_return, stock_volatility, bond_return, bond_volatility, correlation):
+    """
+    绘制固收-权益组合的有效前沿
+
+    参数:
+    stock_return, stock_volatility: 权益预期收益率和波动率 (%)
+    bond_return, bond_volatility: 固收预期收益率和波动率 (%)
+    correlation: 权益和固收的相关系数
+
+    返回:
+    fig: 图表
+    """
+    # 股票权重从0%到100%，组合波动率通过校验后的相关矩阵因子计算
+    _, factor, _ = prepare_correlation([[1.0, correlation], [correlation, 1.0]])
+
+    def calculate(weights_stock):
+        weights = np.column_stack([weights_stock, 1 - weights_stock])
+        returns = weights @ np.array([stock_return, bond_return])
+        return returns, portfolio_volatility(weights, [stock_volatility, bond_volatility], factor)
+
+    portfolio_returns, portfolio_volatilities = calculate(np.linspace(0, 1, 101))
+
+    fig, ax1 = plt.subplots(figsize=(20, 14))
+
+    # 绘制有效前沿曲线
+    ax1.plot(portfolio_volatilities, portfolio_returns, 'b-', linewidth=5, label='有效前沿')
+
+    # 标注纯权益和纯固收点
+    ax1.scatter([bond_volatility], [bond_return], s=600, c='blue',
+                marker='s', edgecolors='black', linewidths=3, zorder=5, label='纯固收')
+    ax1.annotate(f'纯固收\n收益率: {bond_return}%\n波动率: {bond_volatility}%',
+                 xy=(bond_volatility, bond_return),
+                 xytext=(15, 15), textcoords='offset points',
+                 fontsize=28, fontweight='bold',
+                 bbox=dict(boxstyle='round,pad=0.8', facecolor='lightblue',
+                           alpha=0.8, edgecolor='black', linewidth=3))
+
+    ax1.scatter([stock_volatility], [stock_return], s=600, c='red',
+                marker='s', edgecolors='black', linewidths=3, zorder=5, label='纯权益')
+    ax1.annotate(f'纯权益\n收益率: {stock_return}%\n波动率: {stock_volatility}%',
+                 xy=(stock_volatility, stock_return),
+                 xytext=(15, -25), textcoords='offset points',
+                 fontsize=28, fontweight='bold',
+                 bbox=dict(boxstyle='round,pad=0.8', facecolor='lightcoral',
+                           alpha=0.8, edgecolor='black', linewidth=3))
+
+    # 标注几个典型组合：60%权益40%固收，和20%权益80%固收
+    typical_weights = [0.6, 0.2]
+    typical_colors = ['green', 'orange']
+    typical_labels = ['60%权益\n40%固收', '20%权益\n80%固收']
+    typical_returns, typical_volatilities = calculate(np.array(typical_weights))
+    for i, (ret, vol) in enumerate(zip(typical_returns, typical_volatilities)):
+        ax1.scatter([vol], [ret], s=500, c=typical_colors[i],
+                    marker='o', edgecolors='black', linewidths=3, zorder=5)
+        # 标注组合配置、预期收益率和波动率
+        annotation_text = f'{typical_labels[i]}\n收益率: {ret:.2f}%\n波动率: {vol:.2f}%'
+        ax1.annotate(annotation_text,
+                     xy=(vol, ret),
+                     xytext=(15, 15) if i == 0 else (15, -25),
+                     textcoords='offset points',
+                     fontsize=28, fontweight='bold',
+                     bbox=dict(boxstyle='round,pad=0.8', facecolor=typical_colors[i],
+                               alpha=0.8, edgecolor='black', linewidth=3))
+
+    ax1.set_xlabel('组合波动率 (%)', fontsize=36, fontweight='bold')
+    ax1.set_ylabel('组合预期收益率 (%)', fontsize=36, fontweight='bold')
+    ax1.set_title('固收-权益组合的有效前沿', fontsize=44, fontweight='bold', pad=20)
+    ax1.grid(True, linestyle='--', alpha=0.3)
+    ax1.legend(fontsize=32, loc='lower right')
+    ax1.tick_params(axis='both', which='major', labelsize=32)
+
+    fig.tight_layout()
+    return fig
+
+
+def draw_taa_hierarchy(top_node_name, first_level_nodes, category_colors):
+    """
+    绘制 TAA 层次结构图
+
+    参数:
+    top_node_name: 顶层节点名称
+    first_level_nodes: 第一层节点 [{'name', 'category', 'x'}, ...]
+    category_colors: {策略分类: 颜色}
+
+    返回:
+    fig: 图表
+    """
+    # 创建图表 - 更大的画布以适应复杂布局
+    fig, ax = plt.subplots(figsize=(24, 16))
+
+    # 顶层节点 - 使用矩形框（蓝色）
+    top_node = {
+        'name': top_node_name,
+        'pos': (0.5, 0.88),
+        'color': '#4472C4',  # 深蓝色
+        'width': 0.15,
+        'height': 0.08
+    }
+
+    # 第一层节点 - 水平排列，颜色按风险特征分类
+    first_level_y = 0.6
+    node_width = 0.12
+    node_height = 0.06
+
+    # 绘制连接线 - 从顶层到第一层（垂直连接）
+    for node in first_level_nodes:
+        ax.plot([top_node['pos'][0], node['x']],
+                [top_node['pos'][1] - top_node['height']/2, first_level_y + node_height/2],
+                'k-', linewidth=3, alpha=0.5, zorder=1)
+
+    # 绘制顶层节点 - 矩形框
+    top_rect = mpatches.Rectangle(
+        (top_node['pos'][0] - top_node['width']/2, top_node['pos'][1] - top_node['height']/2),
+        top_node['width'], top_node['height'],
+        facecolor=top_node['color'],
+        edgecolor='black', linewidth=3,
+        zorder=3, alpha=0.9
+    )
+    ax.add_patch(top_rect)
+    ax.text(top_node['pos'][0], top_node['pos'][1], top_node['name'],
+            ha='center', va='center', fontsize=44, fontweight='bold',
+            color='white', zorder=4)
+
+    # 绘制第一层节点 - 矩形框
+    for node in first_level_nodes:
+        rect = mpatches.Rectangle(
+            (node['x'] - node_width/2, first_level_y - node_height/2),
+            node_width, node_height,
+            facecolor=category_colors[node['category']],
+            edgecolor='black', linewidth=2.5,
+            zorder=3, alpha=0.85
+        )
+        ax.add_patch(rect)
+
+        # 添加文字 - 根据文字长度调整字体大小
+        fontsize = 32 if len(node['name']) <= 6 else 28
+        ax.text(node['x'], first_level_y, node['name'],
+                ha='center', va='center', fontsize=fontsize, fontweight='bold',
+                color='white', zorder=4)
+
+    # 左侧标签区域 - 垂直排列
+    left_labels = [
+        {'text': '配置引领', 'y': 0.75},
+        {'text': '策略驱动', 'y': 0.6},
+        {'text': '交易协同', 'y': 0.45}
+    ]
+
+    for label in left_labels:
+        ax.text(0.02, label['y'], label['text'],
+                ha='left', va='center', fontsize=32, fontweight='bold',
+                color='#333333', transform=ax.transAxes)
+
+    # 右侧策略分类说明
+    for (category, color), y in zip(category_colors.items(), [0.75, 0.65]):
+        # 绘制分类节点
+        cat_rect = mpatches.Rectangle(
+            (0.92 - 0.08, y - 0.03),
+            0.16, 0.06,
+            facecolor=color,
+            edgecolor='black', linewidth=2,
+            zorder=3, alpha=0.85
+        )
+        ax.add_patch(cat_rect)
+        ax.text(0.92, y, category,
+                ha='center', va='center', fontsize=28, fontweight='bold',
+                color='white', zorder=4)
+
+    # 添加分类说明文字
+    category_text = '以风险特征为标准，将策略明确划分为\n稳定收益类和波动类两大类'
+    ax.text(0.92, 0.55, category_text,
+            ha='center', va='top', fontsize=24,
+            color='#666666', transform=ax.transAxes,
+            bbox=dict(boxstyle='round,pad=0.5', facecolor='white',
+                      edgecolor='gray', alpha=0.8, linewidth=1))
+
+    # 设置坐标轴
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.axis('off')
+
+    # 添加标题
+    ax.text(0.5, 0.96, '多策略下的均衡、分散性配置',
+            ha='center', va='top', fontsize=52, fontweight='bold',
+            transform=ax.transAxes, color='#1a1a1a')
+
+    # 添加层级标签
+    ax.text(0.5, 0.68, '一级策略',
+            ha='center', va='center', fontsize=28,
+            color='#666666', style='italic', transform=ax.transAxes)
+
+    fig.tight_layout()
+    return fig
+
+
+# ==================== 资产配置与有效前沿 ====================
+# 有效前沿图中的策略颜色，策略多于颜色数时循环使用
+strategy_colors = ['#5B9BD5', '#4472C4', '#70AD47', '#FFC000', '#ED7D31', '#C5504B', '#A5A5A5']
+
+# efficient_frontier.py 中各策略标注的偏移量（避免重叠），其他策略使用默认偏移量
+annotation_offsets = {
+    '固收配置策略': (0.3, 0.2),
+    '固收+': (0.3, -0.3),
+    'SAA策略': (0.4, 0.2),
+    '外委多资产策略': (0.4, -0.3),
+    '权益-': (0.5, 0.2),
+    '权益策略': (0.5, -0.3),
+    '权益+': (0.5, 0.2),
+}
+default_annotation_offset = (0.3, 0.15)
+
+# 每个策略一个值的客户字段
+allocation_keys = ['fixed_income_ratio', 'equity_ratio', 'alternative_ratio']
+frontier_keys = ['expected_returns', 'volatilities']
+
+
+def fit_frontier(volatilities, expected_returns):
+    """
+    按 efficient_frontier.py 的方法拟合有效前沿：y = a + b*sqrt(x)
+
+    返回:
+    vol_smooth, ret_smooth: 前沿曲线的 x、y 数据
+    """
+    efficient_points = []
+    max_return = -np.inf
+    for i in np.argsort(volatilities):
+        if expected_returns[i] >= max_return:
+            efficient_points.append(i)
+            max_return = expected_returns[i]
+
+    eff_vol = np.array([volatilities[i] for i in efficient_points])
+    eff_ret = np.array([expected_returns[i] for i in efficient_points])
+    vol_smooth = np.linspace(max(0.1, eff_vol[0] - 0.5), eff_vol[-1] + 1, 300)
+    if len(eff_vol) < 2:
+        return vol_smooth, np.full_like(vol_smooth, eff_ret[0])
+    b, a = np.polyfit(np.sqrt(eff_vol), eff_ret, 1)
+    return vol_smooth, a + b * np.sqrt(vol_smooth)
+
+
+class AllocationTemplate:
+    """
+    资产配置堆叠柱状图模板
+
+    strategy_visualization.py 直接使用默认布局；highlight=False 时去掉存量/新策略
+    边框和说明，对应 strategy_visualization_v2.py。创建一次后可以用 update
+    反复更新数据，批量渲染、监视模式和报告都复用同一个模板
+    """
+
+    def __init__(self, strategies=strategies, highlight=True, figsize=(28, 18)):
+        self.strategies = list(strategies)
+        self.fig, ax = plt.subplots(figsize=figsize)
+        self.ax = ax
+        x_positions = np.arange(len(strategies))
+        zeros = np.zeros(len(strategies))
+        bar_width = 0.6
+
+        self.bars = [
+            ax.bar(x_positions, zeros, bar_width, label='固收', color='#5B9BD5', alpha=0.8),
+            ax.bar(x_positions, zeros, bar_width, bottom=zeros, label='权益', color='#ED7D31', alpha=0.8),
+            ax.bar(x_positions, zeros, bar_width, bottom=zeros, label='另类资产', color='#70AD47', alpha=0.8),
+        ]
+
+        # 存量/新策略高亮边框不随客户变化
+        if highlight:
+            for i, strategy in enumerate(strategies):
+                if strategy in existing_strategies:
+                    ax.bar(x_positions[i], 100, bar_width, edgecolor='green', linewidth=8, fill=False, zorder=10)
+                elif strategy in new_strategies:
+                    ax.bar(x_positions[i], 100, bar_width, edgecolor='red', linewidth=8, fill=False, zorder=10)
+
+        self.range_texts = []
+        self.ratio_texts = []
+        for x, strategy in zip(x_positions, strategies):
+            if highlight and strategy in existing_strategies:
+                ax.text(x, 108, strategy + ' ★', ha='center', va='bottom',
+                        fontsize=44, fontweight='bold', color='green')
+            elif highlight and strategy in new_strategies:
+                ax.text(x, 108, strategy + ' ★', ha='center', va='bottom',
+                        fontsize=44, fontweight='bold', color='red')
+            else:
+                ax.text(x, 108, strategy, ha='center', va='bottom', fontsize=44, fontweight='bold')
+            self.range_texts.append(ax.text(x, -10, '', ha='center', va='top',
+                                            fontsize=40, color='#333333'))
+            # 每个柱子三段占比文字：固收、权益、另类
+            self.ratio_texts.append([ax.text(x, 0, '', ha='center', va='center', fontsize=40,
+                                             color='white', fontweight='bold')
+                                     for _ in range(3)])
+
+        ax.set_xlabel('收益率区间（年化）', fontsize=52, fontweight='bold', labelpad=15)
+        ax.set_ylabel('资产配置占比（%）', fontsize=52, fontweight='bold')
+        self.title = ax.set_title('不同策略的资产配置与预期收益率', fontsize=64, fontweight='bold', pad=20)
+        ax.set_ylim(-30, 125)
+        ax.set_yticks(range(0, 101, 10))
+        ax.tick_params(axis='both', which='major', labelsize=40)
+        ax.set_xlim(-0.5, len(strategies) - 0.5)
+        ax.set_xticks(x_positions)
+        ax.set_xticklabels([])
+        ax.grid(axis='y', linestyle='--', alpha=0.3)
+        ax.set_axisbelow(True)
+        ax.legend(loc='upper left', fontsize=44, framealpha=0.9)
+        ax.text(0.5, -24, '← 低风险', ha='center', fontsize=44, color='#666666', style='italic')
+        ax.text(len(strategies) - 1.5, -24, '高风险 →', ha='center', fontsize=44,
+                color='#666666', style='italic')
+        if highlight:
+            ax.text(0.55, 0.02, '★ 红框标注为新策略', transform=ax.transAxes, ha='right', va='bottom',
+                    fontsize=36, fontweight='bold', color='red',
+                    bbox=dict(boxstyle='round,pad=0.5', facecolor='white', edgecolor='red',
+                              linewidth=3, alpha=0.9))
+            ax.text(0.78, 0.02, '★ 绿框标注为存量策略', transform=ax.transAxes, ha='right', va='bottom',
+                    fontsize=36, fontweight='bold', color='green',
+                    bbox=dict(boxstyle='round,pad=0.5', facecolor='white', edgecolor='green',
+                              linewidth=3, alpha=0.9))
+
+        # 布局只计算一次，之后每次更新数据不再重新计算
+        self.fig.tight_layout()
+
+    def update(self, client, return_ranges=None):
+        """
+        只更新柱高、占比文字和收益率区间
+        """
+        check_lengths(client, allocation_keys, len(self.strategies))
+        segments = [client[key] for key in allocation_keys]
+        if return_ranges is None:
+            return_ranges = calculate_return_ranges(client)
+        for i in range(len(self.strategies)):
+            bottom = 0
+            for seg, bars in enumerate(self.bars):
+                height = segments[seg][i]
+                rect = bars.patches[i]
+                rect.set_y(bottom)
+                rect.set_height(height)
+                text = self.ratio_texts[i][seg]
+                text.set_visible(height > 5)
+                text.set_y(bottom + height / 2)
+                text.set_text(f'{height}%')
+                bottom += height
+            self.range_texts[i].set_text(return_ranges[i])
+
+    def save(self, path, dpi, **kwargs):
+        self.fig.savefig(path, dpi=dpi, bbox_inches='tight', **kwargs)
+
+
+class FrontierTemplate:
+    """
+    有效前沿散点图模板，efficient_frontier.py 直接使用该模板
+    """
+
+    def __init__(self, strategies=strategies):
+        self.fig, ax = plt.subplots(figsize=(24, 16))
+        self.ax = ax
+        n = len(strategies)
+        colors = [strategy_colors[i % len(strategy_colors)] for i in range(n)]
+        self.scatter = ax.scatter(np.zeros(n), np.zeros(n), s=800, c=colors,
+                                  alpha=0.8, edgecolors='black', linewidths=5, zorder=3)
+        self.annotations = []
+        for strategy in strategies:
+            offset = annotation_offsets.get(strategy, default_annotation_offset)
+            self.annotations.append(ax.annotate(
+                strategy, (0, 0), xytext=offset, textcoords='offset fontsize',
+                fontsize=44, fontweight='bold',
+                bbox=dict(boxstyle='round,pad=0.5', facecolor='white',
+                          edgecolor='gray', alpha=0.8, linewidth=2)))
+        self.frontier_line, = ax.plot([], [], color='#5B8DB8', linestyle='-',
+                                      linewidth=7, alpha=0.75, label='有效前沿', zorder=1)
+
+        ax.grid(True, linestyle='--', alpha=0.4, zorder=0)
+        ax.set_axisbelow(True)
+        ax.set_xlabel('波动率（年化标准差，%）', fontsize=56, fontweight='bold', labelpad=15)
+        ax.set_ylabel('预期收益率（年化，%）', fontsize=56, fontweight='bold', labelpad=15)
+        ax.set_title('资产配置策略有效前沿', fontsize=68, fontweight='bold', pad=25)
+        ax.tick_params(axis='both', which='major', labelsize=44)
+        ax.legend(loc='lower right', fontsize=48, framealpha=0.9)
+        info_text = '风险收益特征：\n低波动率 → 固收类策略\n高波动率 → 权益及另类策略'
+        ax.text(0.02, 0.98, info_text, transform=ax.transAxes, fontsize=40, verticalalignment='top',
+                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5, pad=1))
+
+        # 用默认数据确定刻度宽度后计算一次布局
+        self.update(default_assumptions['efficient_frontier'])
+        self.fig.tight_layout()
+
+    def update(self, client, frontier=None):
+        """
+        只更新散点位置、标注位置、前沿曲线和坐标轴范围
+        """
+        check_lengths(client, frontier_keys, len(self.annotations))
+        volatilities = client['volatilities']
+        expected_returns = client['expected_returns']
+        self.scatter.set_offsets(np.column_stack([volatilities, expected_returns]))
+        for annotation, vol, ret in zip(self.annotations, volatilities, expected_returns):
+            annotation.xy = (vol, ret)
+        if frontier is None:
+            frontier = fit_frontier(volatilities, expected_returns)
+        self.frontier_line.set_data(*frontier)
+        self.ax.set_xlim(0, max(volatilities) + 2)
+        self.ax.set_ylim(min(expected_returns) - 1, max(expected_returns) + 1)
+
+    def save(self, path, dpi, **kwargs):
+        self.fig.savefig(path, dpi=dpi, bbox_inches='tight', **kwargs)
@@ -0,0 +1,238 @@
+"""
+计算结果导出为列式数据表（CSV / Parquet / Arrow）
+
+把各脚本中只以 print 输出的数值结果写成带类型的表：
+- sharpe_ratios：策略风险收益与夏普比率（efficient_frontier.py）
+- weight_grid：权益-固收权重网格的组合收益与波动率（portfolio_theory_visualization.py）
+- strategy_allocation / strategy_allocation_v2：配置比例与收益率区间上下限
+- taa_nodes：TAA 层次结构节点（taa_hierarchy.py）
+
+所有表都以记录批次（record batch）逐批写入，大规模网格（如 1 亿行）
+不需要在内存中整体构建。Parquet/Arrow 需要安装 pyarrow，CSV 只用标准库。
+
+用法：
+python export_tables.py --output-dir output/tables --format parquet --grid-points 100000001
+"""
+import argparse
+import csv
+import os
+
+import numpy as np
+
+from assumptions import (calculate_return_bounds, default_assumptions, portfolio_theory,
+                         risk_free_rate, strategies, taa_first_level_nodes, taa_top_node)
+from correlation import portfolio_volatility, prepare_correlation
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# 列类型：string / int64 / float64
+column_types = ('string', 'int64', 'float64')
+
+# ==================== 基础参数 ====================
+stock_return = portfolio_theory['stock_return']
+stock_volatility = portfolio_theory['stock_volatility']
+bond_return = portfolio_theory['bond_return']
+bond_volatility = portfolio_theory['bond_volatility']
+# 校验后的相关矩阵因子，组合波动率通过因子计算
+correlation_factor = prepare_correlation([[1.0, portfolio_theory['correlation']],
+                                          [portfolio_theory['correlation'], 1.0]])[1]
+
+
+# ==================== 写入器 ====================
+class CSVTableWriter:
+    """
+    逐批写入 CSV，第一行为列名
+    """
+
+    def __init__(self, path, schema):
+        self.schema = schema
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow([name for name, _ in schema])
+
+    def write_batch(self, columns):
+        self.writer.writerows(zip(*(columns[name] for name, _ in self.schema)))
+
+    def close(self):
+        self.file.close()
+
+
+class ArrowTableWriter:
+    """
+    逐批写入 Parquet 或 Arrow IPC 文件（需要 pyarrow）
+    """
+
+    def __init__(self, path, schema, file_format):
+        if pa is None:
+            raise ImportError("导出 Parquet/Arrow 需要安装 pyarrow：pip install pyarrow")
+        types = {'string': pa.string(), 'int64': pa.int64(), 'float64': pa.float64()}
+        self.schema = pa.schema([(name, types[type_]) for name, type_ in schema])
+        if file_format == 'parquet':
+            self.writer = pq.ParquetWriter(path, self.schema)
+        else:
+            self.writer = pa.ipc.new_file(path, self.schema)
+
+    def write_batch(self, columns):
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(columns[field.name], type=field.type) for field in self.schema],
+            schema=self.schema)
+        self.writer.write_batch(batch)
+
+    def close(self):
+        self.writer.close()
+
+
+def open_writer(path, schema):
+    """
+    按文件扩展名选择写入器：.csv / .parquet / .arrow
+
+    参数:
+    path: 输出文件路径
+    schema: [(列名, 类型), ...]，类型为 string / int64 / float64
+    """
+    for name, type_ in schema:
+        if type_ not in column_types:
+            raise ValueError(f"列 '{name}' 的类型 '{type_}' 不受支持")
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.csv':
+        return CSVTableWriter(path, schema)
+    if ext in ('.parquet', '.arrow'):
+        return ArrowTableWriter(path, schema, ext[1:])
+    raise ValueError(f"不支持的导出格式：'{ext}'")
+
+
+def write_table(path, schema, batches):
+    """
+    把批次迭代器逐批写入文件，每个批次是 {列名: 列数据}
+
+    返回:
+    rows: 写入的总行数
+    """
+    writer = open_writer(path, schema)
+    rows = 0
+    try:
+        for columns in batches:
+            writer.write_batch(columns)
+            rows += len(columns[schema[0][0]])
+    finally:
+        writer.close()
+    return rows
+
+
+# ==================== 数据表 ====================
+sharpe_schema = [('strategy', 'string'), ('expected_return', 'float64'),
+                 ('volatility', 'float64'), ('sharpe_ratio', 'float64')]
+
+
+def sharpe_batches():
+    ef = default_assumptions['efficient_frontier']
+    expected_returns = np.asarray(ef['expected_returns'], dtype=float)
+    volatilities = np.asarray(ef['volatilities'], dtype=float)
+    yield {
+        'strategy': strategies,
+        'expected_return': expected_returns,
+        'volatility': volatilities,
+        'sharpe_ratio': (expected_returns - risk_free_rate) / volatilities,
+    }
+
+
+weight_grid_schema = [('stock_weight', 'float64'), ('bond_weight', 'float64'),
+                      ('portfolio_return', 'float64'), ('portfolio_volatility', 'float64')]
+
+
+def weight_grid_batches(points=101, batch_size=1_000_000):
+    """
+    按批生成权益权重 0%-100% 的组合网格，每批最多 batch_size 行
+
+    参数:
+    points: 网格点数（101 即 1% 步长），至少为 2
+    batch_size: 每批行数，至少为 1
+    """
+    if points < 2:
+        raise ValueError(f"网格点数至少为 2，实际为 {points}")
+    if batch_size < 1:
+        raise ValueError(f"每批行数至少为 1，实际为 {batch_size}")
+    for start in range(0, points, batch_size):
+        stop = min(start + batch_size, points)
+        w_stock = np.arange(start, stop, dtype=float) / (points - 1)
+        w_bond = 1 - w_stock
+        yield {
+            'stock_weight': w_stock,
+            'bond_weight': w_bond,
+            'portfolio_return': w_stock * stock_return + w_bond * bond_return,
+            'portfolio_volatility': portfolio_volatility(np.column_stack([w_stock, w_bond]),
+                                                         [stock_volatility, bond_volatility],
+                                                         correlation_factor),
+        }
+
+
+allocation_schema = [('strategy', 'string'), ('fixed_income_ratio', 'int64'),
+                     ('equity_ratio', 'int64'), ('alternative_ratio', 'int64'),
+                     ('return_min', 'float64'), ('return_max', 'float64')]
+
+
+def allocation_batches(section):
+    """
+    资产配置比例与收益率区间（上下限，%），section 为 strategy_allocation 或 strategy_allocation_v2
+    """
+    alloc = default_assumptions[section]
+    bounds = np.array(calculate_return_bounds({**default_assumptions['asset_returns'], **alloc}), dtype=float)
+    yield {
+        'strategy': alloc['strategies'],
+        'fixed_income_ratio': alloc['fixed_income_ratio'],
+        'equity_ratio': alloc['equity_ratio'],
+        'alternative_ratio': alloc['alternative_ratio'],
+        'return_min': bounds[:, 0],
+        'return_max': bounds[:, 1],
+    }
+
+
+taa_schema = [('name', 'string'), ('level', 'int64'), ('parent', 'string'), ('category', 'string')]
+
+
+def taa_batches():
+    yield {
+        'name': [taa_top_node] + [node['name'] for node in taa_first_level_nodes],
+        'level': [0] + [1] * len(taa_first_level_nodes),
+        'parent': [''] + [taa_top_node] * len(taa_first_level_nodes),
+        'category': [''] + [node['category'] for node in taa_first_level_nodes],
+    }
+
+
+def export_all(output_dir, file_format='csv', grid_points=101, batch_size=1_000_000):
+    """
+    导出所有数据表
+
+    返回:
+    paths: {表名: 文件路径}
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    tables = {
+        'sharpe_ratios': (sharpe_schema, sharpe_batches()),
+        'weight_grid': (weight_grid_schema, weight_grid_batches(grid_points, batch_size)),
+        'strategy_allocation': (allocation_schema, allocation_batches('strategy_allocation')),
+        'strategy_allocation_v2': (allocation_schema, allocation_batches('strategy_allocation_v2')),
+        'taa_nodes': (taa_schema, taa_batches()),
+    }
+    paths = {}
+    for name, (schema, batches) in tables.items():
+        path = os.path.join(output_dir, f'{name}.{file_format}')
+        rows = write_table(path, schema, batches)
+        print(f"已导出 {name}：{rows} 行 → '{path}'")
+        paths[name] = path
+    return paths
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='导出计算结果数据表')
+    parser.add_argument('--output-dir', default=os.path.join('output', 'tables'))
+    parser.add_argument('--format', choices=['csv', 'parquet', 'arrow'], default='csv')
+    parser.add_argument('--grid-points', type=int, default=101)
+    parser.add_argument('--batch-size', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    export_all(args.output_dir, args.format, args.grid_points, args.batch_size)
@@ -0,0 +1,232 @@
+"""
+中文字体解析与持久化缓存
+
+各脚本原来把 rcParams['font.sans-serif'] 设为以 SimHei / Microsoft YaHei 开头的
+列表，在没有这些字体的 Linux 渲染机上，matplotlib 每次都要遍历字体管理器，
+并为每个中文字符发出 findfont 回退警告。
+
+setup_chinese_font 只解析一次可用的中文字体（SimHei、Noto Sans CJK 等，
+也可以放在本目录 fonts/ 下或用环境变量 MAA_CJK_FONT 指定文件），把字体文件路径
+持久化到缓存文件，之后直接加载该文件并设为默认字体，所有图表共用同一个
+FontProperties。找不到字体的结果也会缓存；MAA_CJK_FONT 改变或字体目录中
+增删文件（目录修改时间变化）时缓存失效。
+
+测量与原启动路径的耗时对比：
+python fonts.py --benchmark
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import warnings
+
+from matplotlib import font_manager, rcParams
+from matplotlib.ft2font import FT2Font
+
+# 按优先级排列的中文字体名称
+preferred_fonts = ['SimHei', 'Microsoft YaHei', 'Noto Sans CJK SC', 'Noto Sans SC',
+                   'Source Han Sans SC', 'WenQuanYi Micro Hei', 'WenQuanYi Zen Hei',
+                   'PingFang SC', 'Heiti SC', 'SimSun', 'Arial Unicode MS']
+
+# 字体管理器中没有注册时，在这些目录中按文件名查找
+font_dirs = [
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fonts'),
+    '/usr/share/fonts',
+    '/usr/local/share/fonts',
+    os.path.expanduser('~/.local/share/fonts'),
+    os.path.expanduser('~/.fonts'),
+    '/System/Library/Fonts',
+    '/Library/Fonts',
+    'C:/Windows/Fonts',
+]
+font_file_patterns = ['*SimHei*', '*simhei*', '*msyh*', '*NotoSansCJK*', '*NotoSansSC*',
+                      '*SourceHanSans*', '*wqy*', '*PingFang*', '*CJK*']
+
+cache_path = os.environ.get(
+    'MAA_FONT_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'maa', 'cjk_font.json'))
+
+# 用于检查字体是否包含所需字形
+sample_text = '资产配置策略收益率'
+
+_font = None
+
+
+def _covers_sample(path):
+    try:
+        font = FT2Font(path)
+    except (OSError, RuntimeError):
+        return False
+    return all(font.get_char_index(ord(ch)) for ch in sample_text)
+
+
+def _find_font():
+    """
+    查找可用的中文字体文件，找不到时返回 None
+    """
+    env_path = os.environ.get('MAA_CJK_FONT')
+    if env_path and os.path.exists(env_path) and _covers_sample(env_path):
+        return env_path
+
+    # 已注册到字体管理器的字体：按名称匹配，不触发 findfont 的回退查找
+    registered = {}
+    for entry in font_manager.fontManager.ttflist:
+        registered.setdefault(entry.name, entry.fname)
+    for name in preferred_fonts:
+        if name in registered and _covers_sample(registered[name]):
+            return registered[name]
+
+    for font_dir in font_dirs:
+        if not os.path.isdir(font_dir):
+            continue
+        for pattern in font_file_patterns:
+            for path in sorted(glob.glob(os.path.join(font_dir, '**', pattern), recursive=True)):
+                if path.lower().endswith(('.ttf', '.otf', '.ttc')) and _covers_sample(path):
+                    return path
+    return None
+
+
+def _font_dirs_state():
+    """
+    字体目录及其子目录的修改时间，目录中增删字体文件时会变化
+    """
+    state = {}
+    for font_dir in font_dirs:
+        for root, _, _ in os.walk(font_dir):
+            try:
+                state[root] = os.stat(root).st_mtime_ns
+            except OSError:
+                pass
+    return state
+
+
+def _load_cache(dirs_state):
+    """
+    读取缓存记录，失效时返回 None；记录中的 path 为 None 表示上次没有找到字体
+    """
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            cached = json.load(f)
+        # 指定的字体或字体目录变化后需要重新查找
+        if cached['env_font'] != os.environ.get('MAA_CJK_FONT') or cached['font_dirs'] != dirs_state:
+            return None
+        if cached['path'] is not None:
+            stat = os.stat(cached['path'])
+            # 字体文件被替换或删除后缓存失效
+            if stat.st_size != cached.get('size') or stat.st_mtime_ns != cached.get('mtime_ns'):
+                return None
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return cached
+
+
+def _save_cache(path, dirs_state):
+    record = {'path': path, 'env_font': os.environ.get('MAA_CJK_FONT'), 'font_dirs': dirs_state}
+    try:
+        if path is not None:
+            stat = os.stat(path)
+            record.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(record, f)
+    except OSError:
+        pass
+
+
+def resolve_cjk_font(refresh=False):
+    """
+    返回中文字体文件路径（找不到时为 None），优先使用持久化缓存
+
+    参数:
+    refresh: 忽略缓存重新查找
+    """
+    # 查找前记录目录状态，查找期间新增的字体会在下一次调用时发现
+    dirs_state = _font_dirs_state()
+    cached = None if refresh else _load_cache(dirs_state)
+    if cached is not None:
+        return cached['path']
+    path = _find_font()
+    _save_cache(path, dirs_state)
+    return path
+
+
+def setup_chinese_font():
+    """
+    配置 matplotlib 使用解析到的中文字体
+
+    返回:
+    所有图表共用的 FontProperties；找不到中文字体时返回 None
+    并退回原来的字体列表
+    """
+    global _font
+    if _font is not None:
+        return _font
+
+    rcParams['axes.unicode_minus'] = False
+    path = resolve_cjk_font()
+    if path is None:
+        warnings.warn("未找到中文字体，图表中的中文可能无法显示；"
+                      "可以安装 Noto Sans CJK 或设置环境变量 MAA_CJK_FONT")
+        rcParams['font.sans-serif'] = preferred_fonts + ['DejaVu Sans']
+        return None
+
+    # 直接注册并预加载字体文件，不重建字体缓存
+    font_manager.fontManager.addfont(path)
+    font_manager.get_font(path)
+    _font = font_manager.FontProperties(fname=path)
+    rcParams['font.family'] = 'sans-serif'
+    rcParams['font.sans-serif'] = [_font.get_name(), 'DejaVu Sans']
+    return _font
+
+
+# ==================== 启动耗时对比 ====================
+_benchmark_render = """
+import time
+start = time.perf_counter()
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+{setup}
+fig, ax = plt.subplots(figsize=(24, 16))
+ax.set_title('资产配置策略有效前沿', fontsize=68, fontweight='bold')
+ax.text(0.5, 0.5, '固收配置策略 固收+ SAA策略 外委多资产策略 权益- 权益策略 权益+', fontsize=44)
+fig.canvas.draw()
+print(time.perf_counter() - start)
+"""
+
+_benchmark_setups = {
+    '原字体列表': "from matplotlib import rcParams\n"
+                  "rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'SimSun']\n"
+                  "rcParams['axes.unicode_minus'] = False",
+    '缓存字体': "from fonts import setup_chinese_font\nsetup_chinese_font()",
+}
+
+
+def benchmark(runs=3):
+    """
+    在独立进程中分别用原字体列表和缓存字体绘制一张含中文的图，比较耗时
+    """
+    resolve_cjk_font()
+    env = dict(os.environ, PYTHONWARNINGS='ignore')
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [os.path.dirname(os.path.abspath(__file__)),
+                                                      env.get('PYTHONPATH')]))
+    for label, setup in _benchmark_setups.items():
+        times = []
+        for _ in range(runs):
+            result = subprocess.run([sys.executable, '-c', _benchmark_render.format(setup=setup)],
+                                    capture_output=True, text=True, env=env, check=True)
+            times.append(float(result.stdout.strip().splitlines()[-1]))
+        print(f"{label}：最快 {min(times):.3f} 秒，平均 {sum(times) / len(times):.3f} 秒")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='解析并缓存中文字体')
+    parser.add_argument('--refresh', action='store_true', help='忽略缓存重新查找字体')
+    parser.add_argument('--benchmark', action='store_true', help='对比原启动路径的耗时')
+    args = parser.parse_args()
+
+    font_path = resolve_cjk_font(refresh=args.refresh)
+    print(f"中文字体：{font_path or '未找到'}")
+    if args.benchmark:
+        benchmark()
@@ -0,0 +1,302 @@
+"""
+多页 PDF 报告：所有图表和数据表
+
+把五张图表和各自的数据表直接渲染为 PDF 矢量页，逐页写入（PdfPages），
+每页写完即释放；客户图表页复用 batch_render 的模板图，所以无论 5 页还是
+5000 页，内存占用都基本不变。
+
+开头为目录（各部分的起止页码，条目较多时分为多页），每页的标题和渲染耗时另外写入
+与报告同名的 .json 文件。
+
+用法：
+python report.py --output output/report.pdf [--clients clients.jsonl]
+"""
+import argparse
+import json
+import os
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+
+import export_tables
+from assumptions import (default_assumptions, format_return_range, portfolio_theory,
+                         taa_category_colors, taa_first_level_nodes, taa_top_node)
+from batch_render import load_clients
+from charts import AllocationTemplate, FrontierTemplate, draw_portfolio_theory, draw_taa_hierarchy
+
+# A4 横向页面，用于目录和数据表
+page_size = (11.69, 8.27)
+
+# 每页表格最多显示的行数（不含表头），更多的行分页显示
+table_rows_per_page = 20
+
+# 目录条目的纵向范围和行高（坐标为页面比例）
+contents_top = 0.78
+contents_bottom = 0.02
+section_height = 0.07
+entry_height = 0.045
+section_gap = 0.02
+
+# 数据表列名对应的中文表头（与各脚本打印的表头一致）
+column_labels = {
+    'strategy': '策略名称', 'expected_return': '预期收益率(%)', 'volatility': '波动率(%)',
+    'sharpe_ratio': '夏普比率', 'stock_weight': '权益权重', 'bond_weight': '固收权重',
+    'portfolio_return': '预期收益率(%)', 'portfolio_volatility': '波动率(%)',
+    'fixed_income_ratio': '固收占比(%)', 'equity_ratio': '权益占比(%)',
+    'alternative_ratio': '另类占比(%)', 'return_range': '预期收益率区间',
+    'name': '节点', 'level': '层级', 'parent': '上级节点', 'category': '策略分类',
+}
+
+
+# ==================== 数据表页 ====================
+# 导出的数据表中收益率区间为上下限两列，报告中显示为区间文字
+allocation_display_schema = [(name, type_) for name, type_ in export_tables.allocation_schema
+                             if name not in ('return_min', 'return_max')] + [('return_range', 'string')]
+
+
+def allocation_display_batches(section):
+    for columns in export_tables.allocation_batches(section):
+        yield {**columns, 'return_range': [format_return_range(min_return, max_return) for min_return, max_return
+                                           in zip(columns['return_min'], columns['return_max'])]}
+
+
+def table_rows(schema, batches, formats=None):
+    """
+    把 export_tables 的数据表批次格式化为表格文字
+
+    参数:
+    schema: [(列名, 类型), ...]
+    batches: 批次迭代器
+    formats: {列名: 格式字符串}，浮点列默认保留两位小数
+    """
+    formats = formats or {}
+    rows = []
+    for columns in batches:
+        cells = []
+        for name, type_ in schema:
+            fmt = formats.get(name, '{:.2f}' if type_ == 'float64' else '{}')
+            cells.append([fmt.format(value) for value in columns[name]])
+        rows.extend(zip(*cells))
+    return rows
+
+
+def paginate_table(title, heading, schema, batches, formats=None):
+    """
+    把数据表按 table_rows_per_page 分页，多于一页时页面标题加上页序
+
+    参数:
+    title: 目录和页面耗时记录中的标题
+    heading: 页面标题
+
+    返回:
+    pages: [(标题, 绘制函数, 是否关闭), ...]
+    """
+    rows = table_rows(schema, batches, formats)
+    chunks = [rows[start:start + table_rows_per_page] for start in range(0, len(rows), table_rows_per_page)]
+    pages = []
+    for i, chunk in enumerate(chunks):
+        page_heading = heading if len(chunks) == 1 else f'{heading}（{i + 1}/{len(chunks)}）'
+        pages.append((title, lambda h=page_heading, c=chunk: draw_table(h, schema, c), True))
+    return pages
+
+
+def draw_table(title, schema, rows):
+    """
+    把一页表格行渲染为 PDF 页
+
+    参数:
+    title: 页面标题
+    schema: [(列名, 类型), ...]
+    rows: 表格文字行，最多 table_rows_per_page 行
+    """
+    fig, ax = plt.subplots(figsize=page_size)
+    ax.axis('off')
+    ax.set_title(title, fontsize=20, fontweight='bold', pad=20)
+    table = ax.table(cellText=rows, colLabels=[column_labels.get(name, name) for name, _ in schema], loc='upper center',
+                     cellLoc='center')
+    table.auto_set_font_size(False)
+    table.set_fontsize(12)
+    table.scale(1, 1.6)
+    for (row, _), cell in table.get_celld().items():
+        if row == 0:
+            cell.set_facecolor('#4472C4')
+            cell.set_text_props(color='white', fontweight='bold')
+    return fig
+
+
+def layout_contents(sections):
+    """
+    目录排版：按剩余高度把条目拆分到多页目录
+
+    参数:
+    sections: [(部分名称, 页面标题列表, 首页序号), ...]，首页序号从 0 起、不含目录页；
+              连续相同的页面标题（分页的数据表）合并为一个条目
+
+    返回:
+    pages: 每页目录的条目列表 [(y, 文字, 首页序号, 末页序号, 是否为部分标题), ...]
+    """
+    lines = []
+    for name, titles, first_page in sections:
+        if not titles:
+            continue
+        lines.append((name, first_page, first_page + len(titles) - 1, True))
+        entries = []
+        for page, title in enumerate(titles, first_page):
+            if entries and entries[-1][0] == title:
+                entries[-1][2] = page
+            else:
+                entries.append([title, page, page])
+        # 条目较多的部分（如客户图表）只列出起止页码
+        if len(entries) <= 12:
+            lines.extend((title, first, last, False) for title, first, last in entries)
+
+    pages, y = [[]], contents_top
+    for text, first_page, last_page, is_section in lines:
+        if is_section and pages[-1]:
+            y -= section_gap
+        # 部分标题至少和它的第一个条目放在同一页
+        lowest = y - section_height if is_section else y
+        if lowest < contents_bottom and pages[-1]:
+            pages.append([])
+            y = contents_top
+        pages[-1].append((y, text, first_page, last_page, is_section))
+        y -= section_height if is_section else entry_height
+    return pages
+
+
+def draw_contents(entries, page_offset, continued=False):
+    """
+    目录页：各部分的起止页码
+
+    参数:
+    entries: layout_contents 返回的一页条目
+    page_offset: 目录页数加 1，加到条目的页面序号上得到实际页码
+    continued: 是否为续页
+    """
+    fig, ax = plt.subplots(figsize=page_size)
+    ax.axis('off')
+    ax.set_xlim(0, 1)
+    ax.set_ylim(0, 1)
+    ax.text(0.5, 0.92, '目录（续）' if continued else '目录', ha='center', va='top',
+            fontsize=32, fontweight='bold')
+    for y, text, first_page, last_page, is_section in entries:
+        first_page, last_page = first_page + page_offset, last_page + page_offset
+        pages = f'{first_page}' if last_page == first_page else f'{first_page}-{last_page}'
+        if is_section:
+            ax.text(0.15, y, text, fontsize=22, fontweight='bold')
+            ax.text(0.85, y, pages, ha='right', fontsize=22)
+        else:
+            ax.text(0.2, y, text, fontsize=16, color='#333333')
+            ax.text(0.85, y, pages, ha='right', fontsize=16, color='#333333')
+    return fig
+
+
+# ==================== 报告 ====================
+def build_report(output_path, clients=()):
+    """
+    逐页生成 PDF 报告
+
+    参数:
+    output_path: PDF 路径
+    clients: 客户数据列表（可选），每个客户生成资产配置和有效前沿两页
+
+    返回:
+    pages: [{'page', 'section', 'title', 'seconds'}, ...]，同时写入同名 .json 文件
+    """
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    allocation = AllocationTemplate()
+    allocation_v2 = AllocationTemplate(default_assumptions['strategy_allocation_v2']['strategies'],
+                                       highlight=False, figsize=(24, 18))
+    frontier = FrontierTemplate()
+    returns = default_assumptions['asset_returns']
+
+    # 模板图常驻内存、不关闭；其余图表每页新建，写完即关闭
+    chart_pages = [
+        ('资产配置与预期收益率', lambda: (allocation.update(
+            {**returns, **default_assumptions['strategy_allocation']}), allocation.fig)[1], False),
+        ('资产配置与预期收益率（存量策略）', lambda: (allocation_v2.update(
+            {**returns, **default_assumptions['strategy_allocation_v2']}), allocation_v2.fig)[1], False),
+        ('资产配置策略有效前沿', lambda: (frontier.update(
+            default_assumptions['efficient_frontier']), frontier.fig)[1], False),
+        ('固收-权益组合的有效前沿', lambda: draw_portfolio_theory(**portfolio_theory), True),
+        ('TAA 层次结构', lambda: draw_taa_hierarchy(
+            taa_top_node, taa_first_level_nodes, taa_category_colors), True),
+    ]
+
+    # 数据表行数决定页数，目录需要预先知道页码，所以先格式化所有表格行
+    table_pages = [
+        *paginate_table('策略风险收益特征',
+                        f'策略风险收益特征（无风险利率 {export_tables.risk_free_rate}%）',
+                        export_tables.sharpe_schema, export_tables.sharpe_batches(),
+                        {'sharpe_ratio': '{:.3f}'}),
+        *paginate_table('不同权益-固收配置的组合特征', '不同权益-固收配置的组合特征',
+                        export_tables.weight_grid_schema, export_tables.weight_grid_batches(points=11),
+                        {'stock_weight': '{:.0%}', 'bond_weight': '{:.0%}'}),
+        *paginate_table('策略详细信息', '策略详细信息', allocation_display_schema,
+                        allocation_display_batches('strategy_allocation')),
+        *paginate_table('策略详细信息（存量策略）', '策略详细信息（存量策略）', allocation_display_schema,
+                        allocation_display_batches('strategy_allocation_v2')),
+        *paginate_table('TAA 层次结构节点', 'TAA 层次结构节点',
+                        export_tables.taa_schema, export_tables.taa_batches()),
+    ]
+
+    # 客户页按需生成，不预先构建
+    client_label = {}
+
+    def client_page(template, name, client):
+        if name not in client_label:
+            client_label[name] = template.fig.text(0.99, 0.99, '', ha='right', va='top', fontsize=28)
+        client_label[name].set_text(f"客户：{client['client_id']}")
+        template.update({**returns, **default_assumptions['strategy_allocation'],
+                         **default_assumptions['efficient_frontier'], **client})
+        return template.fig
+
+    def client_pages():
+        for client in clients:
+            yield (f"{client['client_id']} 资产配置", lambda c=client: client_page(allocation, 'allocation', c), False)
+            yield (f"{client['client_id']} 有效前沿", lambda c=client: client_page(frontier, 'frontier', c), False)
+
+    client_titles = [f"{c['client_id']} {kind}" for c in clients for kind in ('资产配置', '有效前沿')]
+    contents = layout_contents([
+        ('图表', [title for title, _, _ in chart_pages], 0),
+        ('数据表', [title for title, _, _ in table_pages], len(chart_pages)),
+        ('客户图表', client_titles, len(chart_pages) + len(table_pages)),
+    ])
+    contents_pages = [('目录', lambda e=entries, i=i: draw_contents(e, len(contents) + 1, i > 0), True)
+                      for i, entries in enumerate(contents)]
+
+    pages = []
+    with PdfPages(output_path) as pdf:
+        pdf.infodict()['Title'] = '资产配置策略报告'
+        page_sources = [('目录', contents_pages),
+                        ('图表', chart_pages), ('数据表', table_pages), ('客户图表', client_pages())]
+        for section, source in page_sources:
+            for title, draw, close in source:
+                start = time.perf_counter()
+                fig = draw()
+                pdf.savefig(fig)
+                if close:
+                    plt.close(fig)
+                pages.append({'page': len(pages) + 1, 'section': section, 'title': title,
+                              'seconds': round(time.perf_counter() - start, 4)})
+
+    for template in (allocation, allocation_v2, frontier):
+        plt.close(template.fig)
+
+    with open(os.path.splitext(output_path)[0] + '.json', 'w', encoding='utf-8') as f:
+        json.dump(pages, f, ensure_ascii=False, indent=2)
+    total = sum(page['seconds'] for page in pages)
+    print(f"报告已保存为 '{output_path}'，共 {len(pages)} 页，耗时 {total:.1f} 秒")
+    return pages
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='生成多页 PDF 报告')
+    parser.add_argument('--output', default=os.path.join('output', 'report.pdf'))
+    parser.add_argument('--clients', help='客户数据文件（JSON Lines），每个客户追加两页')
+    args = parser.parse_args()
+
+    build_report(args.output, load_clients(args.clients) if args.clients else ())
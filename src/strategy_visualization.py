@@ -1,152 +1,34 @@
 import matplotlib.pyplot as plt
-import numpy as np
-from matplotlib import rcParams
 import os
+from assumptions import calculate_return_ranges, default_assumptions
+from charts import AllocationTemplate
+from fonts import setup_chinese_font
 
 # 配置中文字体
-rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei', 'SimSun']
-rcParams['axes.unicode_minus'] = False
+setup_chinese_font()
 
-# 定义策略数据
-strategies = ['固收配置策略', '固收+', 'SAA策略', '外委多资产策略', '权益-', '权益策略', '权益+']
+# 策略数据和基础假设定义在 assumptions.py 中，与导出的数据表、监视模式和报告共用
+asset_returns = default_assumptions['asset_returns']
+allocation = default_assumptions['strategy_allocation']
+strategies = allocation['strategies']
 
 # 三类资产占比
-fixed_income_ratio = [100, 95, 92, 85, 30, 0, 0]  # 固收占比
-equity_ratio = [0, 5, 8, 15, 70, 100, 60]  # 权益占比
-alternative_ratio = [0, 0, 0, 0, 0, 0, 40]  # 另类资产占比（商品、黄金等）
+fixed_income_ratio = allocation['fixed_income_ratio']  # 固收占比
+equity_ratio = allocation['equity_ratio']  # 权益占比
+alternative_ratio = allocation['alternative_ratio']  # 另类资产占比（商品、黄金等）
 
 # 固收、权益和另类资产的基础预期收益率
-fixed_income_return = (3.5, 4.5)  # 固收：3.5%-4.5%
-equity_return = (6.0, 8.0)  # 权益：6%-8%
-alternative_return = (10.0, 13.0)  # 另类资产：10%-13%（商品、黄金等）
+fixed_income_return = asset_returns['fixed_income_return']
+equity_return = asset_returns['equity_return']
+alternative_return = asset_returns['alternative_return']
 
-# 定义每个策略的预期收益率区间（前6个自动计算，权益+手动设置）
-return_ranges = []
-for i in range(len(strategies)):
-    if i < 6:  # 前6个策略根据配置比例计算
-        min_return = (fixed_income_ratio[i] / 100) * fixed_income_return[0] + \
-                     (equity_ratio[i] / 100) * equity_return[0] + \
-                     (alternative_ratio[i] / 100) * alternative_return[0]
-        max_return = (fixed_income_ratio[i] / 100) * fixed_income_return[1] + \
-                     (equity_ratio[i] / 100) * equity_return[1] + \
-                     (alternative_ratio[i] / 100) * alternative_return[1]
-        return_ranges.append(f'{min_return:.1f}-{max_return:.1f}%')
-    else:  # 权益+策略使用固定的8%-10%
-        return_ranges.append('8.0-10.0%')
+# 定义每个策略的预期收益率区间（根据配置比例计算，权益+使用固定区间）
+return_ranges = calculate_return_ranges({**asset_returns, **allocation})
 
-# 使用等间距的x轴位置
-x_positions = np.arange(len(strategies))
-
-# 创建图表
-fig, ax = plt.subplots(figsize=(28, 18))
-
-# 设置柱子宽度
-bar_width = 0.6
-
-# 创建堆叠柱状图
-bars1 = ax.bar(x_positions, fixed_income_ratio, bar_width, 
-               label='固收', color='#5B9BD5', alpha=0.8)
-bars2 = ax.bar(x_positions, equity_ratio, bar_width, 
-               bottom=fixed_income_ratio, label='权益', 
-               color='#ED7D31', alpha=0.8)
-
-# 计算另类资产的bottom位置
-alternative_bottom = [fixed_income_ratio[i] + equity_ratio[i] for i in range(len(strategies))]
-bars3 = ax.bar(x_positions, alternative_ratio, bar_width, 
-               bottom=alternative_bottom, label='另类资产', 
-               color='#70AD47', alpha=0.8)
-
-# 定义存量策略和新策略
-existing_strategies = ['固收配置策略', '权益策略', 'SAA策略']  # 存量策略（绿色）
-new_strategies = ['固收+', '外委多资产策略', '权益-', '权益+']  # 新策略（红色）
-
-# 为策略添加高亮边框
-for i, strategy in enumerate(strategies):
-    if strategy in existing_strategies:
-        # 存量策略：绿色边框
-        ax.bar(x_positions[i], 100, bar_width, 
-               edgecolor='green', linewidth=8, fill=False, zorder=10)
-    elif strategy in new_strategies:
-        # 新策略：红色边框
-        ax.bar(x_positions[i], 100, bar_width, 
-               edgecolor='red', linewidth=8, fill=False, zorder=10)
-
-# 在柱子上添加策略名称
-for i, (x, strategy, return_range) in enumerate(zip(x_positions, strategies, return_ranges)):
-    # 添加策略名称，根据类型使用不同颜色
-    if strategy in existing_strategies:
-        # 存量策略：绿色
-        ax.text(x, 108, strategy + ' ★', ha='center', va='bottom', 
-                fontsize=44, fontweight='bold', color='green')
-    elif strategy in new_strategies:
-        # 新策略：红色
-        ax.text(x, 108, strategy + ' ★', ha='center', va='bottom', 
-                fontsize=44, fontweight='bold', color='red')
-    else:
-        ax.text(x, 108, strategy, ha='center', va='bottom', 
-                fontsize=44, fontweight='bold')
-    
-    # 添加收益率区间
-    ax.text(x, -10, return_range, ha='center', va='top', 
-            fontsize=40, color='#333333')
-    
-    # 在柱子内添加占比文字
-    if fixed_income_ratio[i] > 5:
-        ax.text(x, fixed_income_ratio[i]/2, f'{fixed_income_ratio[i]}%', 
-                ha='center', va='center', fontsize=40, color='white', fontweight='bold')
-    if equity_ratio[i] > 5:
-        ax.text(x, fixed_income_ratio[i] + equity_ratio[i]/2, f'{equity_ratio[i]}%', 
-                ha='center', va='center', fontsize=40, color='white', fontweight='bold')
-    if alternative_ratio[i] > 5:
-        ax.text(x, alternative_bottom[i] + alternative_ratio[i]/2, f'{alternative_ratio[i]}%', 
-                ha='center', va='center', fontsize=40, color='white', fontweight='bold')
-
-# 设置标签和标题
-ax.set_xlabel('收益率区间（年化）', fontsize=52, fontweight='bold', labelpad=15)
-ax.set_ylabel('资产配置占比（%）', fontsize=52, fontweight='bold')
-ax.set_title('不同策略的资产配置与预期收益率', fontsize=64, fontweight='bold', pad=20)
-
-# 设置y轴范围和刻度
-ax.set_ylim(-30, 125)
-ax.set_yticks(range(0, 101, 10))
-
-# 设置刻度标签字体大小
-ax.tick_params(axis='both', which='major', labelsize=40)
-
-# 设置x轴范围和刻度
-ax.set_xlim(-0.5, len(strategies) - 0.5)
-ax.set_xticks(x_positions)
-ax.set_xticklabels([])  # 隐藏默认x轴标签，因为我们用文字标注了
-
-# 添加网格线
-ax.grid(axis='y', linestyle='--', alpha=0.3)
-ax.set_axisbelow(True)
-
-# 添加图例
-ax.legend(loc='upper left', fontsize=44, framealpha=0.9)
-
-# 在底部添加风险等级标注
-ax.text(0.5, -24, '← 低风险', ha='center', fontsize=44, 
-        color='#666666', style='italic')
-ax.text(len(strategies) - 1.5, -24, '高风险 →', ha='center', fontsize=44, 
-        color='#666666', style='italic')
-
-# 添加策略说明（分别用红色和绿色显示）
-# 红色部分
-ax.text(0.55, 0.02, '★ 红框标注为新策略', 
-        transform=ax.transAxes, ha='right', va='bottom',
-        fontsize=36, fontweight='bold', color='red',
-        bbox=dict(boxstyle='round,pad=0.5', facecolor='white', 
-                 edgecolor='red', linewidth=3, alpha=0.9))
-# 绿色部分
-ax.text(0.78, 0.02, '★ 绿框标注为存量策略', 
-        transform=ax.transAxes, ha='right', va='bottom',
-        fontsize=36, fontweight='bold', color='green',
-        bbox=dict(boxstyle='round,pad=0.5', facecolor='white', 
-                 edgecolor='green', linewidth=3, alpha=0.9))
-
-# 调整布局
-plt.tight_layout()
+# 创建图表：与批量渲染、监视模式和报告共用 charts.py 中的模板图
+# 存量策略绿色边框、新策略红色边框（定义在 assumptions.py 中）
+template = AllocationTemplate(strategies)
+template.update({**asset_returns, **allocation}, return_ranges)
 
 # 确保 output 文件夹存在
 output_dir = 'output'
@@ -154,7 +36,7 @@ os.makedirs(output_dir, exist_ok=True)
 
 # 保存图表
 output_path = os.path.join(output_dir, 'strategy_allocation.png')
-plt.savefig(output_path, dpi=300, bbox_inches='tight')
+template.save(output_path, dpi=300)
 print(f"图表已保存为 '{output_path}'")
 
 # 显示图表
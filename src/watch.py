@@ -0,0 +1,253 @@
+"""
+监视模式：基于依赖图的增量重绘
+
+把假设参数、派生数据表和图表建模为依赖图（DAG）。进程常驻，matplotlib、
+NumPy 和模板图一直保留在内存中；假设文件变化时只重新计算变化节点的下游，
+并只重绘受影响的图表。
+
+假设文件为 JSON，每个顶层字段是一个输入节点（不存在时按默认值创建），
+例如修改 asset_returns.equity_return 只会重算两个收益率区间表并重绘两张
+资产配置图，有效前沿、固收-权益组合和 TAA 层次结构图不受影响。未知的
+字段和键会打印警告并忽略。
+
+预览图默认使用屏幕分辨率（72 dpi）和最低的 PNG 压缩级别以缩短重绘时间，
+需要高分辨率图片时使用单图脚本或 batch_render.py。
+
+用法：
+python watch.py --config assumptions.json --output-dir output
+"""
+import argparse
+import copy
+import json
+import os
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+from assumptions import calculate_return_ranges, default_assumptions
+from charts import AllocationTemplate, FrontierTemplate, draw_portfolio_theory, draw_taa_hierarchy, fit_frontier
+from fonts import setup_chinese_font
+
+# 配置中文字体
+setup_chinese_font()
+
+# 预览图的分辨率和 PNG 压缩级别（0-9）：屏幕分辨率已足够预览，
+# 压缩级别越低编码越快，文件稍大
+preview_dpi = 72
+preview_pil_kwargs = {'compress_level': 1}
+
+
+# ==================== 依赖图 ====================
+class DependencyGraph:
+    """
+    简单的依赖图：节点按注册顺序即为拓扑顺序（依赖必须先注册）
+    """
+
+    def __init__(self):
+        self.deps = {}
+        self.funcs = {}
+        self.values = {}
+
+    def add_input(self, name):
+        self.deps[name] = []
+        self.funcs[name] = None
+
+    def add_node(self, name, deps, func):
+        """
+        注册派生节点，func 按 deps 顺序接收依赖节点的值
+        """
+        for dep in deps:
+            if dep not in self.deps:
+                raise ValueError(f"节点 '{name}' 的依赖 '{dep}' 尚未注册")
+        self.deps[name] = list(deps)
+        self.funcs[name] = func
+
+    def downstream(self, changed):
+        """
+        返回 changed 及其所有下游节点（按拓扑顺序）
+        """
+        dirty = set(changed)
+        ordered = []
+        for name, deps in self.deps.items():
+            if name in dirty or dirty.intersection(deps):
+                dirty.add(name)
+                ordered.append(name)
+        return ordered
+
+    def update(self, inputs):
+        """
+        写入变化的输入值并只重算其下游节点
+
+        任一节点重算失败时异常向上抛出，已保存的值保持不变，
+        下一次更新会把这些输入重新视为变化并重算全部下游节点
+
+        返回:
+        recomputed: 被重算的派生节点列表
+        """
+        changed = [name for name, value in inputs.items() if self.values.get(name) != value]
+        values = dict(self.values)
+        for name in changed:
+            values[name] = copy.deepcopy(inputs[name])
+        recomputed = []
+        for name in self.downstream(changed):
+            func = self.funcs[name]
+            if func is None:
+                continue
+            values[name] = func(*(values[dep] for dep in self.deps[name]))
+            recomputed.append(name)
+        self.values = values
+        return recomputed
+
+
+def build_graph(output_dir, dpi):
+    """
+    构建假设 → 数据表 → 图表的依赖图，模板图常驻内存
+
+    资产配置模板按策略列表创建柱子和标注，策略列表变化时重新创建模板
+    """
+    graph = DependencyGraph()
+    for name in default_assumptions:
+        graph.add_input(name)
+
+    allocation_options = {
+        'strategy_allocation': {},
+        'strategy_allocation_v2': {'highlight': False, 'figsize': (24, 18)},
+    }
+    allocation_templates = {}
+    frontier = FrontierTemplate()
+
+    def allocation_template(name, alloc):
+        template = allocation_templates.get(name)
+        if template is None or template.strategies != list(alloc['strategies']):
+            if template is not None:
+                plt.close(template.fig)
+            template = AllocationTemplate(alloc['strategies'], **allocation_options[name])
+            allocation_templates[name] = template
+        return template
+
+    def render(template, filename, data, derived):
+        template.update(data, derived)
+        path = os.path.join(output_dir, filename)
+        template.save(path, dpi, pil_kwargs=preview_pil_kwargs)
+        return path
+
+    def render_figure(fig, filename):
+        try:
+            path = os.path.join(output_dir, filename)
+            fig.savefig(path, dpi=dpi, bbox_inches='tight', pil_kwargs=preview_pil_kwargs)
+        finally:
+            plt.close(fig)
+        return path
+
+    # 派生数据表
+    graph.add_node('return_ranges', ['asset_returns', 'strategy_allocation'],
+                   lambda returns, alloc: calculate_return_ranges({**returns, **alloc}))
+    graph.add_node('return_ranges_v2', ['asset_returns', 'strategy_allocation_v2'],
+                   lambda returns, alloc: calculate_return_ranges({**returns, **alloc}))
+    graph.add_node('frontier_curve', ['efficient_frontier'],
+                   lambda ef: fit_frontier(ef['volatilities'], ef['expected_returns']))
+
+    # 图表
+    graph.add_node('strategy_allocation.png', ['strategy_allocation', 'return_ranges'],
+                   lambda alloc, ranges: render(allocation_template('strategy_allocation', alloc),
+                                                'strategy_allocation.png', alloc, ranges))
+    graph.add_node('strategy_allocation_v2.png', ['strategy_allocation_v2', 'return_ranges_v2'],
+                   lambda alloc, ranges: render(allocation_template('strategy_allocation_v2', alloc),
+                                                'strategy_allocation_v2.png', alloc, ranges))
+    graph.add_node('efficient_frontier.png', ['efficient_frontier', 'frontier_curve'],
+                   lambda ef, curve: render(frontier, 'efficient_frontier.png', ef, curve))
+    # 这两张图元素较少，每次重新绘制
+    graph.add_node('portfolio_theory.png', ['portfolio_theory'],
+                   lambda pt: render_figure(draw_portfolio_theory(**pt), 'portfolio_theory.png'))
+    graph.add_node('taa_hierarchy.png', ['taa_hierarchy'],
+                   lambda taa: render_figure(draw_taa_hierarchy(taa['top_node'], taa['first_level_nodes'],
+                                                                taa['category_colors']),
+                                             'taa_hierarchy.png'))
+    return graph
+
+
+def load_assumptions(path):
+    """
+    读取假设文件，每个字段缺省的键使用该字段的默认值
+
+    未知的字段和键（通常是拼写错误）打印警告后忽略
+    """
+    with open(path, encoding='utf-8') as f:
+        loaded = json.load(f)
+    if not isinstance(loaded, dict):
+        raise ValueError("假设文件的顶层必须是 JSON 对象")
+    for name in loaded:
+        if name not in default_assumptions:
+            print(f"警告：忽略未知的假设字段 '{name}'")
+    assumptions = {}
+    for name, defaults in default_assumptions.items():
+        section = loaded.get(name, {})
+        if not isinstance(section, dict):
+            raise ValueError(f"假设字段 '{name}' 必须是 JSON 对象")
+        for key in section:
+            if key not in defaults:
+                print(f"警告：忽略 '{name}' 中未知的键 '{key}'")
+        assumptions[name] = {key: section.get(key, value) for key, value in defaults.items()}
+    return assumptions
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _refresh(graph, config_path):
+    """
+    读取假设文件并增量更新依赖图；出错时只打印错误，由下一次修改重试
+    """
+    start = time.perf_counter()
+    try:
+        recomputed = graph.update(load_assumptions(config_path))
+    except Exception as e:
+        # 编辑器保存过程中可能读到不完整的 JSON，或者参数本身有误
+        print(f"更新失败：{type(e).__name__}: {e}")
+        return
+    elapsed = (time.perf_counter() - start) * 1000
+    if recomputed:
+        print(f"已更新 {', '.join(recomputed)}（{elapsed:.0f} ms）")
+
+
+def watch(config_path, output_dir, dpi=preview_dpi, interval=0.1):
+    """
+    先完整渲染一次，之后轮询假设文件的修改时间，变化时增量更新依赖图
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if not os.path.exists(config_path):
+        with open(config_path, 'w', encoding='utf-8') as f:
+            json.dump(default_assumptions, f, ensure_ascii=False, indent=2)
+        print(f"已按默认假设创建 '{config_path}'")
+    graph = build_graph(output_dir, dpi)
+    # 先记录修改时间再读取，读取期间发生的修改会在下一次轮询时处理
+    last_mtime = _mtime(config_path)
+    _refresh(graph, config_path)
+    print(f"正在监视 '{config_path}'，按 Ctrl+C 退出")
+    while True:
+        try:
+            mtime = _mtime(config_path)
+            # 文件被删除时等待重新创建
+            if mtime is not None and mtime != last_mtime:
+                last_mtime = mtime
+                _refresh(graph, config_path)
+            time.sleep(interval)
+        except KeyboardInterrupt:
+            break
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='监视假设文件并增量重绘图表')
+    parser.add_argument('--config', default='assumptions.json')
+    parser.add_argument('--output-dir', default='output')
+    parser.add_argument('--dpi', type=int, default=preview_dpi)
+    parser.add_argument('--interval', type=float, default=0.1)
+    args = parser.parse_args()
+
+    watch(args.config, args.output_dir, dpi=args.dpi, interval=args.interval)
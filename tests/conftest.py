@@ -0,0 +1,5 @@
+import os
+import sys
+
+# src 中的模块以脚本方式相互导入（如 from assumptions import ...）
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'src'))
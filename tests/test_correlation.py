@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+import correlation
+from correlation import nearest_correlation, portfolio_volatility, prepare_correlation
+
+# Higham (2002) 中的例子：不是半正定的 3×3 矩阵及其最近相关矩阵
+higham_input = [[1.0, 1.0, 0.0],
+                [1.0, 1.0, 1.0],
+                [0.0, 1.0, 1.0]]
+higham_expected = [[1.0, 0.7607, 0.1573],
+                   [0.7607, 1.0, 0.7607],
+                   [0.1573, 0.7607, 1.0]]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    correlation._cache.clear()
+    yield
+    correlation._cache.clear()
+
+
+def test_higham_example():
+    corr, factor, repaired = prepare_correlation(higham_input)
+    assert repaired
+    np.testing.assert_allclose(corr, higham_expected, atol=1e-4)
+    np.testing.assert_allclose(factor @ factor.T, corr, atol=1e-10)
+
+
+def test_higham_example_without_acceleration():
+    corr = nearest_correlation(np.array(higham_input), memory=0, max_iterations=1000)
+    np.testing.assert_allclose(corr, higham_expected, atol=1e-4)
+
+
+def test_positive_definite_unchanged():
+    matrix = [[1.0, 0.3], [0.3, 1.0]]
+    corr, factor, repaired = prepare_correlation(matrix)
+    assert not repaired
+    np.testing.assert_array_equal(corr, matrix)
+    np.testing.assert_allclose(factor @ factor.T, matrix)
+
+
+@pytest.mark.parametrize('rho, expected', [(1.0, 15.0), (-1.0, 5.0)])
+def test_singular_correlation_kept(rho, expected):
+    # ρ=±1 时 Cholesky 分解失败，但矩阵是半正定的，应原样保留
+    matrix = [[1.0, rho], [rho, 1.0]]
+    corr, factor, repaired = prepare_correlation(matrix)
+    assert not repaired
+    np.testing.assert_array_equal(corr, matrix)
+    np.testing.assert_allclose(factor @ factor.T, matrix, atol=1e-12)
+    assert portfolio_volatility([0.5, 0.5], [10.0, 20.0], factor) == pytest.approx(expected)
+
+
+def test_cached_arrays_read_only():
+    first = prepare_correlation(higham_input)
+    second = prepare_correlation(higham_input)
+    assert second is first
+    for array in first[:2]:
+        assert not array.flags.writeable
+        with pytest.raises(ValueError):
+            array[0, 0] = 0.0
+
+
+def test_asymmetric_rejected():
+    with pytest.raises(ValueError, match='不对称'):
+        prepare_correlation([[1.0, 0.5], [0.2, 1.0]])
+
+
+def test_max_iterations_validated():
+    with pytest.raises(ValueError, match='max_iterations'):
+        nearest_correlation(np.array(higham_input), max_iterations=0)
+
+
+def test_not_converged_warns():
+    with pytest.warns(RuntimeWarning, match='未收敛'):
+        nearest_correlation(np.array(higham_input), max_iterations=1)